@@ -105,6 +105,10 @@ copy_files() {
     # Copy Python package
     cp -r "$script_dir/toggleman" "$INSTALL_DIR/"
 
+    # Precompile bytecode with docstrings stripped; users can't write to
+    # the install dir, so this is the only chance to cache it
+    python3 -OO -m compileall -q "$INSTALL_DIR/toggleman"
+
     # Copy templates
     cp -r "$script_dir/data/templates/"* "$SHARE_DIR/templates/"
 
@@ -126,7 +130,7 @@ create_executable() {
     # Create executable script
     cat > "$BIN_PATH" << EOL
 #!/bin/bash
-python3 "$INSTALL_DIR/toggleman" "\$@"
+python3 -OO "$INSTALL_DIR/toggleman" "\$@"
 EOL
 
     # Make it executable
@@ -3,23 +3,32 @@
 Setup script for Toggleman package
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="toggleman",
     version="1.0.0",
     author="Toggleman Team",
     description="Application toggle script manager for KDE Wayland",
-    packages=find_packages(),
+    packages=[
+        "toggleman",
+        "toggleman.cli",
+        "toggleman.core",
+        "toggleman.gui",
+    ],
     install_requires=[
         "PyQt5>=5.15.0",
         "pyyaml>=5.1.0",
         "dbus-python>=1.2.16",
     ],
-    entry_points={
-        "console_scripts": [
-            "toggleman=toggleman.__main__:main",
-        ],
+    scripts=["bin/toggleman"],
+    # Ship bytecode compiled with -OO (docstrings stripped); the launcher
+    # runs the interpreter with -OO so it picks these up
+    options={
+        "build_py": {
+            "compile": True,
+            "optimize": 2,
+        },
     },
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -28,5 +37,5 @@ setup(
         "Environment :: X11 Applications :: Qt",
         "Topic :: Utilities",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.8",
 )
\ No newline at end of file
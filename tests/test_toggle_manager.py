@@ -0,0 +1,42 @@
+"""
+Tests for the process matching in toggleman.core.toggle_manager.
+"""
+
+import unittest
+
+from toggleman.core.toggle_manager import _compile_process_pattern, _compile_process_prefilter
+
+
+class ProcessPrefilterTest(unittest.TestCase):
+    """The combined prefilter must never reject a command line that one of
+    the individual patterns matches."""
+
+    def assert_prefilter_agrees(self, patterns, cmdline):
+        matches = [bool(_compile_process_pattern(p).search(cmdline)) for p in patterns]
+        prefilter = _compile_process_prefilter(tuple(patterns))
+        if prefilter is not None:
+            self.assertEqual(bool(prefilter.search(cmdline)), any(matches))
+
+    def test_backreferences_are_not_combined(self):
+        patterns = ("(a)\\1x", "(b)\\1y")
+        self.assertIsNone(_compile_process_prefilter(patterns))
+        self.assert_prefilter_agrees(patterns, "run bby")
+
+    def test_named_backreferences_are_not_combined(self):
+        self.assertIsNone(_compile_process_prefilter(("(?P<n>a)(?P=n)", "b")))
+
+    def test_inline_flags_are_not_combined(self):
+        patterns = ("(?x) foo \\d+", "sleep 98765")
+        self.assertIsNone(_compile_process_prefilter(patterns))
+        self.assert_prefilter_agrees(patterns, "sleep 98765")
+        self.assertIsNone(_compile_process_prefilter(("firefox", "(?i)chrome")))
+
+    def test_plain_patterns_are_combined(self):
+        patterns = ("firefox.*--class=web", "sleep [0-9]+", "foo[")
+        self.assertIsNotNone(_compile_process_prefilter(patterns))
+        for cmdline in ("/usr/bin/firefox --class=web", "sleep 12", "vim foo[", "bash"):
+            self.assert_prefilter_agrees(patterns, cmdline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,8 +6,6 @@ Provides both CLI and GUI interfaces.
 
 import sys
 import os
-import argparse
-from PyQt5.QtWidgets import QApplication
 
 # Add path resolution for package imports
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,85 +13,178 @@ parent_dir = os.path.dirname(script_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-# Now we can import modules from the package
-from toggleman.core.config import ConfigManager
-from toggleman.core.debug import setup_logging, get_logger
-from toggleman.gui.main_window import MainWindow
-from toggleman.cli.commands import process_command
 
-logger = get_logger(__name__)
+def _build_list_parser(subparsers, argv):
+    """Add the 'list' subcommand."""
+    subparsers.add_parser("list", help="List all toggle scripts")
 
 
-def parse_args():
-    """Parse command-line arguments."""
-    parser = argparse.ArgumentParser(description="Toggleman - Application toggle script manager for KDE")
-
-    # General options
-    parser.add_argument("--version", action="store_true", help="Show version information")
-    parser.add_argument("--init", action="store_true", help="Initialize default configuration")
-    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
-
-    # GUI options
-    parser.add_argument("--gui", action="store_true", help="Launch GUI (default if no other arguments)")
-    parser.add_argument("--tray", action="store_true", help="Start in system tray only")
-
-    # CLI options
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
-
-    # List command
-    list_parser = subparsers.add_parser("list", help="List all toggle scripts")
-
-    # Create command
+def _build_create_parser(subparsers, argv):
+    """Add the 'create' subcommand."""
     create_parser = subparsers.add_parser("create", help="Create a new toggle script")
     create_parser.add_argument("name", help="Name of the toggle script")
     create_parser.add_argument("--app-command", help="Command to launch the application")
     create_parser.add_argument("--window-class", help="Window class to match")
     create_parser.add_argument("--icon", help="Path to icon file")
 
-    # Edit command
+
+def _build_edit_parser(subparsers, argv):
+    """Add the 'edit' subcommand."""
     edit_parser = subparsers.add_parser("edit", help="Edit an existing toggle script")
     edit_parser.add_argument("name", help="Name of the toggle script")
     edit_parser.add_argument("--app-command", help="Command to launch the application")
     edit_parser.add_argument("--window-class", help="Window class to match")
     edit_parser.add_argument("--icon", help="Path to icon file")
 
-    # Remove command
+
+def _build_remove_parser(subparsers, argv):
+    """Add the 'remove' subcommand."""
     remove_parser = subparsers.add_parser("remove", help="Remove a toggle script")
     remove_parser.add_argument("name", help="Name of the toggle script")
 
-    # Toggle command
+
+def _build_toggle_parser(subparsers, argv):
+    """Add the 'toggle' subcommand."""
     toggle_parser = subparsers.add_parser("toggle", help="Toggle an application window")
     toggle_parser.add_argument("name", help="Name of the toggle script")
 
-    # Run command
+
+def _build_run_parser(subparsers, argv):
+    """Add the 'run' subcommand."""
     run_parser = subparsers.add_parser("run", help="Run an application from a toggle script")
     run_parser.add_argument("name", help="Name of the toggle script")
 
-    # Kwin commands
-    kwin_parser = subparsers.add_parser("kwin", help="KWin integration commands")
-    kwin_subparsers = kwin_parser.add_subparsers(dest="kwin_command", help="KWin commands")
 
-    # Shortcut command
+def _build_kwin_shortcut_parser(kwin_subparsers):
+    """Add the 'kwin shortcut' subcommand."""
     shortcut_parser = kwin_subparsers.add_parser("shortcut", help="Set a KWin shortcut for a toggle script")
     shortcut_parser.add_argument("name", help="Name of the toggle script")
     shortcut_parser.add_argument("shortcut", help="Shortcut key sequence (e.g., 'Meta+Alt+C')")
 
-    # Window rule command
+
+def _build_kwin_rule_parser(kwin_subparsers):
+    """Add the 'kwin rule' subcommand."""
     rule_parser = kwin_subparsers.add_parser("rule", help="Open KWin window rules editor for a toggle script")
     rule_parser.add_argument("name", help="Name of the toggle script")
 
-    return parser.parse_args()
+
+_KWIN_BUILDERS = {
+    "shortcut": _build_kwin_shortcut_parser,
+    "rule": _build_kwin_rule_parser,
+}
+
+
+def _build_kwin_parser(subparsers, argv):
+    """Add the 'kwin' subcommand and the nested command named in argv."""
+    kwin_parser = subparsers.add_parser("kwin", help="KWin integration commands")
+    kwin_subparsers = kwin_parser.add_subparsers(dest="kwin_command", help="KWin commands")
+
+    kwin_command = _sniff_command(argv)
+    if kwin_command in _KWIN_BUILDERS:
+        _KWIN_BUILDERS[kwin_command](kwin_subparsers)
+    else:
+        for build in _KWIN_BUILDERS.values():
+            build(kwin_subparsers)
+
+
+_COMMAND_BUILDERS = {
+    "list": _build_list_parser,
+    "create": _build_create_parser,
+    "edit": _build_edit_parser,
+    "remove": _build_remove_parser,
+    "toggle": _build_toggle_parser,
+    "run": _build_run_parser,
+    "kwin": _build_kwin_parser,
+}
+
+
+_GUI_FLAGS = {"--gui", "--tray", "--debug"}
+
+
+def _sniff_command(argv):
+    """Return the first positional token in argv, or None.
+
+    All global options are flags without values, so the first token that
+    doesn't start with a dash is the subcommand.
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg
+    return None
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments.
+
+    Only the subparser for the command named in argv is built. When no known
+    command is given (e.g. plain --help or a typo) all of them are built so
+    help and error messages stay complete.
+    """
+    import argparse
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # A plain launch needs no parser at all
+    if not argv:
+        return argparse.Namespace(version=False, init=False, debug=False, gui=False, tray=False, command=None)
+
+    parser = argparse.ArgumentParser(description="Toggleman - Application toggle script manager for KDE")
+
+    # General options
+    parser.add_argument("-V", "--version", action="store_true", help="Show version information")
+    parser.add_argument("--init", action="store_true", help="Initialize default configuration")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+
+    # GUI options
+    parser.add_argument("--gui", action="store_true", help="Launch GUI (default if no other arguments)")
+    parser.add_argument("--tray", action="store_true", help="Start in system tray only")
+
+    # GUI launches with only the flags above don't need any subparsers
+    if set(argv) <= _GUI_FLAGS:
+        parser.set_defaults(command=None)
+        return parser.parse_args(argv)
+
+    # CLI options
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    command = _sniff_command(argv)
+    if command in _COMMAND_BUILDERS:
+        rest = argv[argv.index(command) + 1:]
+        _COMMAND_BUILDERS[command](subparsers, rest)
+    else:
+        for build in _COMMAND_BUILDERS.values():
+            build(subparsers, [])
+
+    return parser.parse_args(argv)
+
+
+def _print_version():
+    """Print the Toggleman version."""
+    from toggleman import __version__
+    print(f"Toggleman version {__version__}")
 
 
 def main():
     """Main entry point for the application."""
+    # Answer a bare --version before building the parser or setting up logging
+    if len(sys.argv) == 2 and sys.argv[1] in ("--version", "-V"):
+        _print_version()
+        return 0
+
     args = parse_args()
 
+    # Now we can import modules from the package
+    from toggleman.core.config import ConfigManager
+    from toggleman.core.debug import setup_logging, get_logger
+
+    logger = get_logger(__name__)
+
     # Setup logging
     setup_logging(debug=args.debug)
 
     # Create config manager
-    config = ConfigManager()
+    config = ConfigManager.instance()
 
     # Initialize if requested
     if args.init:
@@ -103,12 +194,12 @@ def main():
 
     # Show version if requested
     if args.version:
-        from toggleman import __version__
-        print(f"Toggleman version {__version__}")
+        _print_version()
         return 0
 
     # Process CLI commands if specified
     if args.command:
+        from toggleman.cli.commands import process_command
         return process_command(args, config)
 
     # Default to GUI if no command specified
@@ -117,6 +208,11 @@ def main():
 
     # Launch GUI if requested
     if args.gui or args.tray:
+        # Qt and the GUI modules are only imported when actually needed so
+        # CLI invocations don't pay for them
+        from PyQt5.QtWidgets import QApplication
+        from toggleman.gui.main_window import MainWindow
+
         app = QApplication(sys.argv)
         app.setApplicationName("Toggleman")
         app.setQuitOnLastWindowClosed(False)  # Allow running in system tray
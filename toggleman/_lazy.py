@@ -0,0 +1,38 @@
+"""
+Lazy package exports for Toggleman.
+
+Lets a package's __init__ export names from its submodules without
+importing them until the name is first used.
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, imports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Build the module-level __getattr__ and __dir__ for lazy exports.
+
+    Args:
+        package: The name of the package exporting the names (its __name__)
+        imports: Mapping of exported names to the modules defining them
+
+    Returns:
+        Tuple of (__getattr__, __dir__) functions for the package
+    """
+    def __getattr__(name):
+        """Import an exported name from its submodule on first access."""
+        module_name = imports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name), name)
+        # Cache it on the package so later lookups don't come back here
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        """List the lazily exported names alongside the module globals."""
+        return sorted(set(vars(sys.modules[package])) | set(imports))
+
+    return __getattr__, __dir__
@@ -2,6 +2,16 @@
 CLI package for Toggleman application.
 
 This package provides the command-line interface for managing toggle scripts.
+
+Submodules are imported lazily on first attribute access.
 """
 
-from toggleman.cli.commands import process_command
\ No newline at end of file
+from toggleman._lazy import lazy_exports
+
+_LAZY_IMPORTS = {
+    "process_command": "toggleman.cli.commands",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -5,20 +5,21 @@ This module handles processing of command-line arguments and executing
 the corresponding actions.
 """
 
-import os
 import sys
-import argparse
-from typing import Dict, List, Optional, Any, Tuple
+from typing import TYPE_CHECKING
 
 from toggleman.core.config import ConfigManager
-from toggleman.core.toggle_manager import ToggleManager
-from toggleman.core.kwin import KWinManager
 from toggleman.core.debug import get_logger
 
+if TYPE_CHECKING:
+    import argparse
+    from toggleman.core.toggle_manager import ToggleManager
+    from toggleman.core.kwin import KWinManager
+
 logger = get_logger(__name__)
 
 
-def process_command(args: argparse.Namespace, config: ConfigManager) -> int:
+def process_command(args: "argparse.Namespace", config: ConfigManager) -> int:
     """Process a command-line command.
 
     Args:
@@ -28,28 +29,25 @@ def process_command(args: argparse.Namespace, config: ConfigManager) -> int:
     Returns:
         Exit code (0 for success, non-zero for error)
     """
-    # Create managers
-    toggle_manager = ToggleManager(config)
-    kwin_manager = KWinManager(config)
-
-    # Process commands
+    # Managers are created per command so each command only imports and
+    # initializes what it actually uses
     if args.command == "list":
-        return cmd_list(config, toggle_manager)
+        return cmd_list(config, _create_toggle_manager(config))
     elif args.command == "create":
-        return cmd_create(args, config, toggle_manager)
+        return cmd_create(args, config, _create_toggle_manager(config))
     elif args.command == "edit":
-        return cmd_edit(args, config, toggle_manager)
+        return cmd_edit(args, config, _create_toggle_manager(config))
     elif args.command == "remove":
-        return cmd_remove(args, config, toggle_manager)
+        return cmd_remove(args, config, _create_toggle_manager(config))
     elif args.command == "toggle":
-        return cmd_toggle(args, toggle_manager)
+        return cmd_toggle(args, _create_toggle_manager(config))
     elif args.command == "run":
-        return cmd_run(args, toggle_manager)
+        return cmd_run(args, _create_toggle_manager(config))
     elif args.command == "kwin":
         if args.kwin_command == "shortcut":
-            return cmd_kwin_shortcut(args, config, kwin_manager)
+            return cmd_kwin_shortcut(args, config, _create_kwin_manager(config))
         elif args.kwin_command == "rule":
-            return cmd_kwin_rule(args, config, kwin_manager)
+            return cmd_kwin_rule(args, config, _create_kwin_manager(config))
         else:
             print(f"Unknown KWin command: {args.kwin_command}")
             return 1
@@ -58,7 +56,19 @@ def process_command(args: argparse.Namespace, config: ConfigManager) -> int:
         return 1
 
 
-def cmd_list(config: ConfigManager, toggle_manager: ToggleManager) -> int:
+def _create_toggle_manager(config: ConfigManager) -> "ToggleManager":
+    """Import and create a toggle manager."""
+    from toggleman.core.toggle_manager import ToggleManager
+    return ToggleManager(config)
+
+
+def _create_kwin_manager(config: ConfigManager) -> "KWinManager":
+    """Import and create a KWin manager."""
+    from toggleman.core.kwin import KWinManager
+    return KWinManager(config)
+
+
+def cmd_list(config: ConfigManager, toggle_manager: "ToggleManager") -> int:
     """List all toggle scripts.
 
     Args:
@@ -69,37 +79,35 @@ def cmd_list(config: ConfigManager, toggle_manager: ToggleManager) -> int:
         Exit code (0 for success, non-zero for error)
     """
     scripts = config.get_all_scripts()
-    running_toggles = toggle_manager.get_running_toggles()
 
     if not scripts:
         print("No toggle scripts found.")
         return 0
 
-    print(f"Found {len(scripts)} toggle scripts:")
-    print("")
+    # Only look up running processes once we know there is something to list
+    running_toggles = frozenset(toggle_manager.get_running_toggles())
 
-    for name, script_config in scripts.items():
-        # Get status (running or not)
-        status = "RUNNING" if name in running_toggles else "STOPPED"
+    out = [f"Found {len(scripts)} toggle scripts:\n\n"]
 
-        # Get path
+    for name, script_config in scripts.items():
+        desc = script_config.get("description", "No description")
         path = script_config.get("script_path", "Not generated")
-
-        # Get shortcut
         shortcut = script_config.get("kwin_shortcut", "None")
+        status = "RUNNING" if name in running_toggles else "STOPPED"
+
+        out.append(f"- {name}:\n"
+                   f"  Description: {desc}\n"
+                   f"  Status: {status}\n"
+                   f"  Path: {path}\n"
+                   f"  Shortcut: {shortcut}\n\n")
 
-        # Print info
-        print(f"- {name}:")
-        print(f"  Description: {script_config.get('description', 'No description')}")
-        print(f"  Status: {status}")
-        print(f"  Path: {path}")
-        print(f"  Shortcut: {shortcut}")
-        print("")
+    # Write the whole listing at once
+    sys.stdout.write("".join(out))
 
     return 0
 
 
-def cmd_create(args: argparse.Namespace, config: ConfigManager, toggle_manager: ToggleManager) -> int:
+def cmd_create(args: "argparse.Namespace", config: ConfigManager, toggle_manager: "ToggleManager") -> int:
     """Create a new toggle script.
 
     Args:
@@ -153,7 +161,7 @@ def cmd_create(args: argparse.Namespace, config: ConfigManager, toggle_manager:
         return 1
 
 
-def cmd_edit(args: argparse.Namespace, config: ConfigManager, toggle_manager: ToggleManager) -> int:
+def cmd_edit(args: "argparse.Namespace", config: ConfigManager, toggle_manager: "ToggleManager") -> int:
     """Edit an existing toggle script.
 
     Args:
@@ -201,7 +209,7 @@ def cmd_edit(args: argparse.Namespace, config: ConfigManager, toggle_manager: To
         return 1
 
 
-def cmd_remove(args: argparse.Namespace, config: ConfigManager, toggle_manager: ToggleManager) -> int:
+def cmd_remove(args: "argparse.Namespace", config: ConfigManager, toggle_manager: "ToggleManager") -> int:
     """Remove a toggle script.
 
     Args:
@@ -235,7 +243,7 @@ def cmd_remove(args: argparse.Namespace, config: ConfigManager, toggle_manager:
         return 1
 
 
-def cmd_toggle(args: argparse.Namespace, toggle_manager: ToggleManager) -> int:
+def cmd_toggle(args: "argparse.Namespace", toggle_manager: "ToggleManager") -> int:
     """Toggle an application window.
 
     Args:
@@ -255,7 +263,7 @@ def cmd_toggle(args: argparse.Namespace, toggle_manager: ToggleManager) -> int:
         return 1
 
 
-def cmd_run(args: argparse.Namespace, toggle_manager: ToggleManager) -> int:
+def cmd_run(args: "argparse.Namespace", toggle_manager: "ToggleManager") -> int:
     """Run an application from a toggle script.
 
     Args:
@@ -275,7 +283,7 @@ def cmd_run(args: argparse.Namespace, toggle_manager: ToggleManager) -> int:
         return 1
 
 
-def cmd_kwin_shortcut(args: argparse.Namespace, config: ConfigManager, kwin_manager: KWinManager) -> int:
+def cmd_kwin_shortcut(args: "argparse.Namespace", config: ConfigManager, kwin_manager: "KWinManager") -> int:
     """Set a KWin shortcut for a toggle script.
 
     Args:
@@ -302,7 +310,7 @@ def cmd_kwin_shortcut(args: argparse.Namespace, config: ConfigManager, kwin_mana
         return 1
 
 
-def cmd_kwin_rule(args: argparse.Namespace, config: ConfigManager, kwin_manager: KWinManager) -> int:
+def cmd_kwin_rule(args: "argparse.Namespace", config: ConfigManager, kwin_manager: "KWinManager") -> int:
     """Open KWin window rules editor for a toggle script.
 
     Args:
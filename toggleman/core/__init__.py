@@ -2,11 +2,26 @@
 Core package for Toggleman application.
 
 This package provides the core functionality for managing toggle scripts.
+
+Submodules are imported lazily on first attribute access, so importing a
+single submodule (e.g. toggleman.core.config) doesn't pull in the others.
 """
 
-from toggleman.core.config import ConfigManager
-from toggleman.core.toggle_manager import ToggleManager
-from toggleman.core.script_generator import ScriptGenerator
-from toggleman.core.kwin import KWinManager
-from toggleman.core.debug import get_logger, setup_logging
-from toggleman.core.web_app_detector import WebAppDetector, WebApp, get_web_app_detector, scan_web_apps_in_background
\ No newline at end of file
+from toggleman._lazy import lazy_exports
+
+_LAZY_IMPORTS = {
+    "ConfigManager": "toggleman.core.config",
+    "ToggleManager": "toggleman.core.toggle_manager",
+    "ScriptGenerator": "toggleman.core.script_generator",
+    "KWinManager": "toggleman.core.kwin",
+    "get_logger": "toggleman.core.debug",
+    "setup_logging": "toggleman.core.debug",
+    "WebAppDetector": "toggleman.core.web_app_detector",
+    "WebApp": "toggleman.core.web_app_detector",
+    "get_web_app_detector": "toggleman.core.web_app_detector",
+    "scan_web_apps_in_background": "toggleman.core.web_app_detector",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -6,9 +6,7 @@ and individual toggle scripts.
 """
 
 import os
-import json
-import yaml
-import shutil
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
@@ -20,25 +18,64 @@ logger = get_logger(__name__)
 class ConfigManager:
     """Manages configuration for Toggleman and toggle scripts."""
 
+    # System-wide data directory (templates, icons)
+    system_config_dir = "/usr/share/toggleman"
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "ConfigManager":
+        """Get the shared configuration manager, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
     def __init__(self):
         """Initialize the configuration manager."""
-        # Define configuration paths
-        self.user_config_dir = Path(os.path.expanduser("~/.config/toggleman"))
-        self.system_config_dir = Path("/usr/share/toggleman")
-        self.scripts_dir = self.user_config_dir / "scripts"
-        self.config_file = self.user_config_dir / "config.yaml"
-
-        # Create necessary directories if they don't exist
-        self.user_config_dir.mkdir(parents=True, exist_ok=True)
-        self.scripts_dir.mkdir(parents=True, exist_ok=True)
+        # Define configuration paths. Loading only needs plain strings; the
+        # Path attributes below are built on first use.
+        self._user_config_dir_str = os.path.expanduser("~/.config/toggleman")
+        self._scripts_dir_str = os.path.join(self._user_config_dir_str, "scripts")
+        self._config_file_str = os.path.join(self._user_config_dir_str, "config.yaml")
+
+        # Pickled copies of the parsed configuration, used to skip YAML/JSON
+        # parsing when the source files haven't changed
+        self._config_cache_str = os.path.join(self._user_config_dir_str, "config.cache.pkl")
+        self._scripts_cache_str = os.path.join(self._user_config_dir_str, "scripts.cache.pkl")
+
+        # Create necessary directories on first run
+        if not os.path.exists(self._config_file_str):
+            self.user_config_dir.mkdir(parents=True, exist_ok=True)
+            self.scripts_dir.mkdir(parents=True, exist_ok=True)
 
         # Load configuration
         self.config = self._load_config()
         self.scripts = self._load_scripts()
 
+        # Bumped whenever a script configuration is saved or deleted, so
+        # callers can tell when derived data needs rebuilding
+        self.scripts_version = 0
+
+    @cached_property
+    def user_config_dir(self) -> Path:
+        """The user configuration directory."""
+        return Path(self._user_config_dir_str)
+
+    @cached_property
+    def scripts_dir(self) -> Path:
+        """The directory holding toggle script configurations."""
+        return Path(self._scripts_dir_str)
+
+    @cached_property
+    def config_file(self) -> Path:
+        """The main configuration file."""
+        return Path(self._config_file_str)
+
     def _load_config(self) -> Dict[str, Any]:
         """Load the main configuration file."""
-        if not self.config_file.exists():
+        if not os.path.exists(self._config_file_str):
+            import yaml
+
             # Create default configuration
             default_config = {
                 "general": {
@@ -63,18 +100,29 @@ class ConfigManager:
             }
 
             # Save default configuration
-            with open(self.config_file, 'w') as f:
-                yaml.dump(default_config, f, default_flow_style=False)
+            with open(self._config_file_str, 'w') as f:
+                yaml.dump(default_config, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                          default_flow_style=False)
 
             return default_config
 
         try:
-            with open(self.config_file, 'r') as f:
-                config = yaml.safe_load(f)
+            stat = os.stat(self._config_file_str)
+            signature = (stat.st_mtime_ns, stat.st_size)
 
-            # Validate and update if necessary
-            if not config:
-                config = {}
+            config = self._read_cache(self._config_cache_str, signature)
+            if config is None:
+                import yaml
+
+                with open(self._config_file_str, 'r') as f:
+                    # Prefer the libyaml-backed loader when available
+                    config = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+                # Validate and update if necessary
+                if not config:
+                    config = {}
+
+                self._write_cache(self._config_cache_str, signature, config)
 
             # Ensure all required sections exist
             if "general" not in config:
@@ -102,43 +150,149 @@ class ConfigManager:
         scripts = {}
 
         try:
+            try:
+                with os.scandir(self._scripts_dir_str) as it:
+                    script_entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+            except FileNotFoundError:
+                return scripts
+
+            # Creating, deleting or replacing a file bumps the directory mtime;
+            # editing one in place changes its own mtime or size. Every file is
+            # part of the key, since a file restored with its old mtime (cp -p)
+            # wouldn't move the newest mtime.
+            signature = (
+                os.stat(self._scripts_dir_str).st_mtime_ns,
+                tuple(sorted((e.name, st.st_mtime_ns, st.st_size)
+                             for e in script_entries for st in (e.stat(),))),
+            )
+
+            cached = self._read_cache(self._scripts_cache_str, signature)
+            if cached is not None:
+                return cached
+
+            # orjson is optional; fall back to the standard library
+            try:
+                from orjson import loads as json_loads
+            except ImportError:
+                from json import loads as json_loads
+
             # Iterate through script configuration files
-            for script_file in self.scripts_dir.glob("*.json"):
-                with open(script_file, 'r') as f:
-                    script_config = json.load(f)
+            for entry in script_entries:
+                with open(entry.path, 'rb') as f:
+                    script_config = json_loads(f.read())
 
                 # Use filename (without .json) as the script name
-                script_name = script_file.stem
+                script_name = entry.name[:-5]
                 scripts[script_name] = script_config
 
+            self._write_cache(self._scripts_cache_str, signature, scripts)
+
         except Exception as e:
             logger.error(f"Error loading script configurations: {e}")
 
         return scripts
 
+    def _read_cache(self, cache_file: str, signature: tuple) -> Optional[Any]:
+        """Read cached data if it was stored for the given source signature.
+
+        Args:
+            cache_file: The pickle cache file
+            signature: Signature of the source file(s) the data was parsed from
+
+        Returns:
+            The cached data, or None if the cache is missing or stale
+        """
+        import pickle
+
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_signature, data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache {cache_file}: {e}")
+            return None
+
+        if cached_signature != signature:
+            return None
+
+        return data
+
+    def _write_cache(self, cache_file: str, signature: tuple, data: Any) -> None:
+        """Atomically write parsed data to a pickle cache.
+
+        Args:
+            cache_file: The pickle cache file
+            signature: Signature of the source file(s) the data was parsed from
+            data: The parsed data
+        """
+        import pickle
+
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((signature, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.debug(f"Could not write cache {cache_file}: {e}")
+            self._discard_file(tmp_file)
+
+    def _discard_file(self, path: Union[str, Path]) -> None:
+        """Remove a leftover temporary file, ignoring errors.
+
+        Args:
+            path: The file to remove
+        """
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
     def save_config(self) -> bool:
         """Save the main configuration to disk."""
+        import yaml
+
+        # Write to a temporary file and rename it into place so an interrupted
+        # save never leaves a truncated configuration behind
+        tmp_file = self.config_file.with_name(f"{self.config_file.name}.tmp")
         try:
-            with open(self.config_file, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+            with open(tmp_file, 'w') as f:
+                yaml.dump(self.config, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                          default_flow_style=False)
+            os.replace(tmp_file, self.config_file)
+
+            # Refresh the cache so the next load doesn't have to re-parse
+            stat = self.config_file.stat()
+            self._write_cache(self._config_cache_str, (stat.st_mtime_ns, stat.st_size), self.config)
+
             return True
         except Exception as e:
             logger.error(f"Error saving configuration: {e}")
+            self._discard_file(tmp_file)
             return False
 
     def save_script(self, name: str, config: Dict[str, Any]) -> bool:
         """Save a toggle script configuration to disk."""
+        import json
+
+        script_file = self.scripts_dir / f"{name}.json"
+        tmp_file = script_file.with_name(f"{script_file.name}.tmp")
         try:
-            script_file = self.scripts_dir / f"{name}.json"
-            with open(script_file, 'w') as f:
+            if not self.scripts_dir.is_dir():
+                self.scripts_dir.mkdir(parents=True, exist_ok=True)
+
+            with open(tmp_file, 'w') as f:
                 json.dump(config, f, indent=2)
+            os.replace(tmp_file, script_file)
 
             # Update scripts dictionary
             self.scripts[name] = config
+            self.scripts_version += 1
 
             return True
         except Exception as e:
             logger.error(f"Error saving script configuration for {name}: {e}")
+            self._discard_file(tmp_file)
             return False
 
     def delete_script(self, name: str) -> bool:
@@ -152,6 +306,7 @@ class ConfigManager:
             # Remove from scripts dictionary
             if name in self.scripts:
                 del self.scripts[name]
+                self.scripts_version += 1
 
             return True
         except Exception as e:
@@ -164,7 +319,8 @@ class ConfigManager:
 
     def get_all_scripts(self) -> Dict[str, Dict[str, Any]]:
         """Get all toggle script configurations."""
-        return self.scripts
+        # Return a copy so callers can't add or remove entries behind our back
+        return dict(self.scripts)
 
     def get_setting(self, section: str, key: str, default: Any = None) -> Any:
         """Get a setting from the configuration."""
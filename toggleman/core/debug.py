@@ -8,16 +8,119 @@ import os
 import sys
 import logging
 import time
-from logging.handlers import RotatingFileHandler
+import queue
+import atexit
+import functools
+from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 # Global log level
 _DEBUG_MODE = False
 _LOG_LEVEL = logging.INFO
-_LOG_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
 _LOG_DIR = None
-_LOG_FILE = None
+_LOG_FILE_HANDLER = None
+_LOG_LISTENER = None
+
+# Number of days to keep log files for
+_LOG_RETENTION_DAYS = 7
+
+# External commands reported in the debug information
+_DEBUG_COMMANDS = ("qdbus", "xdotool", "notify-send", "kwriteconfig5", "kwin")
+
+
+class _FastFormatter(logging.Formatter):
+    """Formats records as '<time> [<level>] <name>: <message>'.
+
+    Builds the line with an f-string and takes the timestamp from datetime,
+    skipping the %-style template parsing and time.strftime() call the
+    default formatter does for every record.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record."""
+        timestamp = datetime.fromtimestamp(record.created).isoformat(sep=" ", timespec="milliseconds")
+        text = f"{timestamp} [{record.levelname}] {record.name}: {record.getMessage()}"
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            text = f"{text}\n{record.exc_text}"
+        if record.stack_info:
+            text = f"{text}\n{self.formatStack(record.stack_info)}"
+
+        return text
+
+
+class _AppendFileHandler(logging.Handler):
+    """Log handler that appends each record to the day's log file with a single write.
+
+    The file is opened with O_APPEND, so each record lands whole without
+    Python-level buffering, even when several processes share the file.
+    The first record of a new day moves the handler on to that day's file,
+    so a long-running tray doesn't keep writing to the day it started.
+    """
+
+    def __init__(self, log_dir: Path, retention_days: int):
+        """Initialize the handler.
+
+        Args:
+            log_dir: The directory to write the log files to
+            retention_days: Number of days to keep log files for
+        """
+        super().__init__()
+        self.log_dir = log_dir
+        self.retention_days = retention_days
+        self.filename = None
+        self._fd = None
+        self._day_end = 0.0
+        self._open_day(time.time())
+
+    def _open_day(self, now: float) -> None:
+        """Switch to the log file for the day containing a timestamp.
+
+        Log files older than the retention period are pruned at the same
+        time, once the new file is open.
+
+        Args:
+            now: The timestamp to open the log file for
+        """
+        day = datetime.fromtimestamp(now).date()
+        filename = str(self.log_dir / f"toggleman-{day:%Y%m%d}.log")
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = fd
+        self.filename = filename
+        self._day_end = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+
+        _prune_log_files(self.log_dir, self.retention_days, keep=filename)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record to the log file."""
+        if self._fd is None:
+            return
+
+        try:
+            if record.created >= self._day_end:
+                self._open_day(record.created)
+
+            os.write(self._fd, (self.format(record) + "\n").encode("utf-8"))
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        """Close the log file."""
+        self.acquire()
+        try:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        finally:
+            self.release()
+        super().close()
 
 
 def setup_logging(debug: bool = False, log_dir: Optional[str] = None) -> None:
@@ -27,7 +130,7 @@ def setup_logging(debug: bool = False, log_dir: Optional[str] = None) -> None:
         debug: Whether to enable debug logging
         log_dir: Optional directory to store log files
     """
-    global _DEBUG_MODE, _LOG_LEVEL, _LOG_DIR, _LOG_FILE
+    global _DEBUG_MODE, _LOG_LEVEL, _LOG_DIR, _LOG_FILE_HANDLER, _LOG_LISTENER
 
     _DEBUG_MODE = debug
     _LOG_LEVEL = logging.DEBUG if debug else logging.INFO
@@ -40,10 +143,6 @@ def setup_logging(debug: bool = False, log_dir: Optional[str] = None) -> None:
 
     _LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Set up log file
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    _LOG_FILE = _LOG_DIR / f"toggleman-{timestamp}.log"
-
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(_LOG_LEVEL)
@@ -52,8 +151,11 @@ def setup_logging(debug: bool = False, log_dir: Optional[str] = None) -> None:
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
+    # Shut down the listener from a previous setup
+    _stop_log_listener()
+
     # Create and add handlers
-    formatter = logging.Formatter(_LOG_FORMAT)
+    formatter = _FastFormatter()
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -61,17 +163,75 @@ def setup_logging(debug: bool = False, log_dir: Optional[str] = None) -> None:
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
 
-    # File handler
-    file_handler = RotatingFileHandler(_LOG_FILE, maxBytes=1024 * 1024 * 5, backupCount=5)
-    file_handler.setLevel(_LOG_LEVEL)
+    # File handler. There is one log file per day, shared by every process
+    # running that day, so logs are never rotated mid-file; old days are
+    # pruned whenever a process starts a new day's file instead.
+    file_handler = _AppendFileHandler(_LOG_DIR, _LOG_RETENTION_DAYS)
+    _LOG_FILE_HANDLER = file_handler
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+
+    # The file handler runs on a background listener thread, so logging calls
+    # only put the record on a queue and never block on disk I/O. Console
+    # output stays synchronous to keep it ordered with the CLI's own output.
+    # Levels are applied when records are queued, so changing them later
+    # doesn't affect records that are already waiting.
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(_LOG_LEVEL)
+    root_logger.addHandler(queue_handler)
+
+    _LOG_LISTENER = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _LOG_LISTENER.start()
 
     # Log initial message
     root_logger.info(f"Logging initialized (level: {'DEBUG' if debug else 'INFO'})")
     if debug:
         root_logger.debug(f"Debug mode enabled")
-    root_logger.debug(f"Log file: {_LOG_FILE}")
+    root_logger.debug(f"Log file: {file_handler.filename}")
+
+
+def _prune_log_files(log_dir: Path, retention_days: int, keep: Optional[str] = None) -> None:
+    """Delete log files that haven't been written to for a number of days.
+
+    Args:
+        log_dir: The directory containing the log files
+        retention_days: Number of days to keep log files for
+        keep: A log file to leave alone regardless of its age
+    """
+    cutoff = time.time() - retention_days * 86400
+
+    try:
+        with os.scandir(log_dir) as it:
+            for entry in it:
+                if not (entry.name.startswith("toggleman-") and ".log" in entry.name):
+                    continue
+                if entry.path == keep:
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def _stop_log_listener() -> None:
+    """Stop the background log listener, flushing and closing its handlers."""
+    global _LOG_LISTENER
+
+    if _LOG_LISTENER is None:
+        return
+
+    _LOG_LISTENER.stop()
+    for handler in _LOG_LISTENER.handlers:
+        handler.close()
+
+    _LOG_LISTENER = None
+
+
+# Flush queued records before the interpreter exits
+atexit.register(_stop_log_listener)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -92,8 +252,7 @@ def get_log_file() -> Optional[str]:
     Returns:
         The path to the current log file, or None if not set
     """
-    global _LOG_FILE
-    return str(_LOG_FILE) if _LOG_FILE else None
+    return _LOG_FILE_HANDLER.filename if _LOG_FILE_HANDLER is not None else None
 
 
 def get_log_files() -> List[str]:
@@ -106,8 +265,12 @@ def get_log_files() -> List[str]:
     if not _LOG_DIR:
         return []
 
-    log_files = list(_LOG_DIR.glob("toggleman-*.log"))
-    return [str(f) for f in sorted(log_files, key=lambda x: x.stat().st_mtime, reverse=True)]
+    # DirEntry caches its stat result, so sorting doesn't stat each file again
+    with os.scandir(_LOG_DIR) as it:
+        log_files = [e for e in it if e.name.startswith("toggleman-") and e.name.endswith(".log")]
+
+    log_files.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    return [e.path for e in log_files]
 
 
 def is_debug_enabled() -> bool:
@@ -141,53 +304,102 @@ def set_debug_mode(enabled: bool) -> None:
     root_logger.info(f"Debug mode {'enabled' if enabled else 'disabled'}")
 
 
-def get_debug_info() -> Dict[str, Any]:
+def get_debug_info(include_env: bool = False) -> Dict[str, Any]:
     """Get debugging information about the application environment.
 
+    Args:
+        include_env: Whether to include environment variables. Off by
+            default since they are rarely needed and may contain secrets.
+
     Returns:
         A dictionary containing debugging information
     """
     import platform
-    import sys
     import psutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    commands = _DEBUG_COMMANDS
+
+    # The KDE version and command checks mostly wait on subprocesses and the
+    # psutil snapshots on syscalls, so run them all concurrently while the
+    # rest of the information is collected
+    with ThreadPoolExecutor(max_workers=len(commands) + 3) as executor:
+        memory_future = executor.submit(psutil.virtual_memory)
+        disk_future = executor.submit(psutil.disk_usage, '/')
+        kde_version_future = executor.submit(_get_kde_version)
+        command_futures = {cmd: executor.submit(_check_command, cmd) for cmd in commands}
+
+        # Take each snapshot once rather than per field
+        memory = memory_future.result()
+        disk = disk_future.result()
+
+        # Get basic system info
+        info = {
+            "platform": platform.platform(),
+            "python_version": sys.version,
+            "python_path": sys.executable,
+            "cpu_count": _available_cpu_count(),
+            "cpu_count_physical": _physical_cpu_count(),
+            "memory": {
+                "total": memory.total,
+                "available": memory.available,
+                "percent": memory.percent
+            },
+            "disk": {
+                "total": disk.total,
+                "used": disk.used,
+                "free": disk.free,
+                "percent": disk.percent
+            }
+        }
+
+        if include_env:
+            info["env_vars"] = {k: v for k, v in os.environ.items() if k[:1] != '_'}
+
+        # Check for KDE/Wayland
+        info["kde_version"] = kde_version_future.result()
+        info["wayland"] = os.environ.get("XDG_SESSION_TYPE") == "wayland"
+
+        # Check for required commands; versions are only probed on request,
+        # see get_command_versions()
+        info["commands"] = {cmd: future.result() for cmd, future in command_futures.items()}
 
-    # Get basic system info
-    info = {
-        "platform": platform.platform(),
-        "python_version": sys.version,
-        "python_path": sys.executable,
-        "cpu_count": os.cpu_count(),
-        "memory": {
-            "total": psutil.virtual_memory().total,
-            "available": psutil.virtual_memory().available,
-            "percent": psutil.virtual_memory().percent
-        },
-        "disk": {
-            "total": psutil.disk_usage('/').total,
-            "used": psutil.disk_usage('/').used,
-            "free": psutil.disk_usage('/').free,
-            "percent": psutil.disk_usage('/').percent
-        },
-        "env_vars": {k: v for k, v in os.environ.items() if not k.startswith('_')}
-    }
+    return info
 
-    # Check for KDE/Wayland
-    info["kde_version"] = _get_kde_version()
-    info["wayland"] = os.environ.get("XDG_SESSION_TYPE") == "wayland"
 
-    # Check for required commands
-    commands = ["qdbus", "xdotool", "notify-send", "kwriteconfig5", "kwin"]
-    info["commands"] = {}
+def _available_cpu_count() -> Optional[int]:
+    """Get the number of CPUs this process may run on.
 
-    for cmd in commands:
-        info["commands"][cmd] = _check_command(cmd)
+    Unlike os.cpu_count(), this respects affinity masks set by taskset or
+    cgroup cpusets, so it doesn't over-report inside containers.
 
-    return info
+    Returns:
+        The number of usable CPUs, or None if it can't be determined
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+@functools.lru_cache(maxsize=1)
+def _physical_cpu_count() -> Optional[int]:
+    """Get the number of physical CPU cores.
+
+    The result is cached for the lifetime of the process.
+
+    Returns:
+        The number of physical cores, or None if it can't be determined
+    """
+    import psutil
+    return psutil.cpu_count(logical=False)
 
 
+@functools.lru_cache(maxsize=1)
 def _get_kde_version() -> Optional[str]:
     """Get the KDE version.
 
+    The result is cached for the lifetime of the process.
+
     Returns:
         The KDE version, or None if not available
     """
@@ -195,7 +407,7 @@ def _get_kde_version() -> Optional[str]:
         import subprocess
         result = subprocess.run(["plasmashell", "--version"],
                                 stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL,
                                 encoding='utf-8')
 
         if result.returncode == 0:
@@ -206,51 +418,89 @@ def _get_kde_version() -> Optional[str]:
         return None
 
 
-def _check_command(command: str) -> Dict[str, Any]:
-    """Check if a command is available and get its version.
+def get_command_versions() -> Dict[str, Optional[str]]:
+    """Get the versions of the commands reported in the debug information.
+
+    Each available command is run with --version (or -v), so this is kept
+    separate from get_debug_info().
+
+    Returns:
+        A dictionary mapping each command to its version, or None if the
+        command is not available or did not report a version
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(_DEBUG_COMMANDS)) as executor:
+        results = executor.map(lambda cmd: _check_command(cmd, probe_version=True),
+                               _DEBUG_COMMANDS)
+        return {cmd: result["version"] for cmd, result in zip(_DEBUG_COMMANDS, results)}
+
+
+def _check_command(command: str, probe_version: bool = False) -> Dict[str, Any]:
+    """Check if a command is available and optionally get its version.
 
     Args:
         command: The command to check
+        probe_version: Whether to run the command to get its version
 
     Returns:
         A dictionary with information about the command
     """
-    import subprocess
-    import shutil
+    available, path, version = _probe_command(command, probe_version)
 
-    result = {
-        "available": False,
-        "path": None,
-        "version": None
+    return {
+        "available": available,
+        "path": path,
+        "version": version
     }
 
+
+@functools.lru_cache(maxsize=None)
+def _probe_command(command: str, probe_version: bool) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Look up a command and optionally its version.
+
+    The result is cached for the lifetime of the process, so repeated
+    checks don't spawn the version probes again.
+
+    Args:
+        command: The command to check
+        probe_version: Whether to run the command to get its version
+
+    Returns:
+        Tuple of (available, path, version)
+    """
+    import subprocess
+    import shutil
+
     # Check if command exists
     path = shutil.which(command)
-    if path:
-        result["available"] = True
-        result["path"] = path
+    if not path:
+        return False, None, None
 
-        # Try to get version
-        try:
-            version_proc = subprocess.run([command, "--version"],
+    version = None
+    if not probe_version:
+        return True, path, version
+
+    # Try to get version; stderr is never read, and stdout is only decoded
+    # once a probe succeeds
+    try:
+        version_proc = subprocess.run([command, "--version"],
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL,
+                                      timeout=1)
+
+        if version_proc.returncode == 0:
+            version = version_proc.stdout.decode('utf-8', 'replace').strip()
+        else:
+            # Some commands use -v instead
+            version_proc = subprocess.run([command, "-v"],
                                           stdout=subprocess.PIPE,
-                                          stderr=subprocess.PIPE,
-                                          encoding='utf-8',
+                                          stderr=subprocess.DEVNULL,
                                           timeout=1)
 
             if version_proc.returncode == 0:
-                result["version"] = version_proc.stdout.strip()
-            else:
-                # Some commands use -v instead
-                version_proc = subprocess.run([command, "-v"],
-                                              stdout=subprocess.PIPE,
-                                              stderr=subprocess.PIPE,
-                                              encoding='utf-8',
-                                              timeout=1)
-
-                if version_proc.returncode == 0:
-                    result["version"] = version_proc.stdout.strip()
-        except Exception:
-            pass
+                version = version_proc.stdout.decode('utf-8', 'replace').strip()
+    except Exception:
+        pass
 
-    return result
\ No newline at end of file
+    return True, path, version
@@ -6,18 +6,59 @@ including setting keyboard shortcuts and opening window rules.
 """
 
 import os
+import functools
+import shutil
 import subprocess
-import tempfile
-import time
-import shlex
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-import dbus
+from typing import Dict, Tuple
 
 from toggleman.core.debug import get_logger
 
 logger = get_logger(__name__)
 
+# KDE tools to look for, each with its candidate commands in order of preference
+_KDE_TOOL_CANDIDATES = (
+    ("kcmshell", ("kcmshell5", "kcmshell6")),
+    ("systemsettings", ("systemsettings5", "systemsettings")),
+    ("kmenuedit", ("kmenuedit", "kmenuedit5")),
+    ("opener", ("kde-open5", "kde-open", "xdg-open")),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_kde_tools(path_env: str) -> Dict[str, str]:
+    """Find the available KDE tools.
+
+    The result is cached and shared by all KWinManager instances. It is
+    keyed on the PATH value, so a changed PATH triggers a fresh lookup.
+
+    Args:
+        path_env: The PATH value the tools are looked up in
+
+    Returns:
+        Dictionary mapping each found tool to its command
+    """
+    kde_tools = {}
+
+    for tool, candidates in _KDE_TOOL_CANDIDATES:
+        for command in candidates:
+            if _is_command_available(command):
+                kde_tools[tool] = command
+                break
+
+    return kde_tools
+
+
+def _is_command_available(command: str) -> bool:
+    """Check if a command is available in the PATH.
+
+    Args:
+        command: The command to check
+
+    Returns:
+        True if the command is available, False otherwise
+    """
+    return shutil.which(command) is not None
+
 
 class KWinManager:
     """Manages integration with KWin."""
@@ -33,32 +74,7 @@ class KWinManager:
 
     def _detect_kde_tools(self):
         """Detect available KDE tools."""
-        self.kde_tools = {}
-        
-        # Check for kcmshell versions
-        for tool in ["kcmshell5", "kcmshell6"]:
-            if self._is_command_available(tool):
-                self.kde_tools["kcmshell"] = tool
-                break
-                
-        # Check for systemsettings versions
-        for tool in ["systemsettings5", "systemsettings"]:
-            if self._is_command_available(tool):
-                self.kde_tools["systemsettings"] = tool
-                break
-                
-        # Check for kmenuedit versions
-        for tool in ["kmenuedit", "kmenuedit5"]:
-            if self._is_command_available(tool):
-                self.kde_tools["kmenuedit"] = tool
-                break
-                
-        # Check for shortcut tools
-        for tool in ["kde-open5", "kde-open", "xdg-open"]:
-            if self._is_command_available(tool):
-                self.kde_tools["opener"] = tool
-                break
-                
+        self.kde_tools = dict(_find_kde_tools(os.environ.get("PATH", "")))
         logger.debug(f"Detected KDE tools: {self.kde_tools}")
 
     def set_shortcut(self, script_name: str, shortcut: str) -> Tuple[bool, str]:
@@ -89,51 +105,41 @@ class KWinManager:
         # Open KDE's shortcut editor
         try:
             # Try different methods to open the shortcut editor
+            kcmshell = self.kde_tools.get("kcmshell")
+            systemsettings = self.kde_tools.get("systemsettings")
+            opener = self.kde_tools.get("opener")
             opened = False
             
             # Method 1: Try KDE's Custom Shortcuts module
-            if "kcmshell" in self.kde_tools:
-                logger.debug(f"Opening custom shortcuts with {self.kde_tools['kcmshell']}")
+            if kcmshell:
+                logger.debug(f"Opening custom shortcuts with {kcmshell}")
                 try:
-                    subprocess.Popen([self.kde_tools["kcmshell"], "kcm_keys"])
+                    subprocess.Popen([kcmshell, "kcm_keys"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening custom shortcuts with kcmshell: {e}")
             
             # Method 2: Try systemsettings
-            if not opened and "systemsettings" in self.kde_tools:
-                logger.debug(f"Opening system settings with {self.kde_tools['systemsettings']}")
+            if not opened and systemsettings:
+                logger.debug(f"Opening system settings with {systemsettings}")
                 try:
-                    if self.kde_tools["systemsettings"] == "systemsettings5":
-                        subprocess.Popen([self.kde_tools["systemsettings"], "keys"])
+                    if systemsettings == "systemsettings5":
+                        subprocess.Popen([systemsettings, "keys"])
                     else:
-                        subprocess.Popen([self.kde_tools["systemsettings"], "--section=shortcuts"])
+                        subprocess.Popen([systemsettings, "--section=shortcuts"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening system settings: {e}")
             
             # Method 3: Use xdg-open or kde-open to open the settings URL
-            if not opened and "opener" in self.kde_tools:
-                logger.debug(f"Opening shortcuts with {self.kde_tools['opener']}")
+            if not opened and opener:
+                logger.debug(f"Opening shortcuts with {opener}")
                 try:
-                    subprocess.Popen([self.kde_tools["opener"], "settings://shortcuts"])
+                    subprocess.Popen([opener, "settings://shortcuts"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening shortcuts with opener: {e}")
             
-            if not opened:
-                # Last resort: Try a direct command
-                logger.debug("Trying direct command to open shortcuts")
-                try:
-                    subprocess.Popen(["systemsettings5", "keys"])
-                    opened = True
-                except Exception:
-                    try:
-                        subprocess.Popen(["systemsettings", "--section=shortcuts"])
-                        opened = True
-                    except Exception as e:
-                        logger.warning(f"Error opening shortcuts with direct command: {e}")
-            
             if opened:
                 return True, (
                     f"Opened KDE shortcut editor.\n\n"
@@ -180,25 +186,27 @@ class KWinManager:
         # Open KDE's shortcut editor for manual removal
         try:
             # Try different methods to open the shortcut editor
+            kcmshell = self.kde_tools.get("kcmshell")
+            systemsettings = self.kde_tools.get("systemsettings")
             opened = False
             
             # Method 1: Try KDE's Custom Shortcuts module
-            if "kcmshell" in self.kde_tools:
-                logger.debug(f"Opening custom shortcuts with {self.kde_tools['kcmshell']}")
+            if kcmshell:
+                logger.debug(f"Opening custom shortcuts with {kcmshell}")
                 try:
-                    subprocess.Popen([self.kde_tools["kcmshell"], "kcm_keys"])
+                    subprocess.Popen([kcmshell, "kcm_keys"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening custom shortcuts with kcmshell: {e}")
             
             # Method 2: Try systemsettings
-            if not opened and "systemsettings" in self.kde_tools:
-                logger.debug(f"Opening system settings with {self.kde_tools['systemsettings']}")
+            if not opened and systemsettings:
+                logger.debug(f"Opening system settings with {systemsettings}")
                 try:
-                    if self.kde_tools["systemsettings"] == "systemsettings5":
-                        subprocess.Popen([self.kde_tools["systemsettings"], "keys"])
+                    if systemsettings == "systemsettings5":
+                        subprocess.Popen([systemsettings, "keys"])
                     else:
-                        subprocess.Popen([self.kde_tools["systemsettings"], "--section=shortcuts"])
+                        subprocess.Popen([systemsettings, "--section=shortcuts"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening system settings: {e}")
@@ -226,17 +234,9 @@ class KWinManager:
         Returns:
             Dictionary mapping script names to shortcuts
         """
-        shortcuts = {}
-
-        # Get all script configurations
-        scripts = self.config_manager.get_all_scripts()
-
-        for name, config in scripts.items():
-            shortcut = config.get("kwin_shortcut", "")
-            if shortcut:
-                shortcuts[name] = shortcut
-
-        return shortcuts
+        return {name: config["kwin_shortcut"]
+                for name, config in self.config_manager.get_all_scripts().items()
+                if config.get("kwin_shortcut")}
 
     def open_window_rules(self, script_name: str) -> Tuple[bool, str]:
         """Open KWin window rules editor for a toggle script.
@@ -259,51 +259,41 @@ class KWinManager:
 
         try:
             # Try different methods to open the window rules editor
+            kcmshell = self.kde_tools.get("kcmshell")
+            systemsettings = self.kde_tools.get("systemsettings")
+            opener = self.kde_tools.get("opener")
             opened = False
             
             # Method 1: Try kcmshell
-            if "kcmshell" in self.kde_tools:
-                logger.debug(f"Opening window rules with {self.kde_tools['kcmshell']}")
+            if kcmshell:
+                logger.debug(f"Opening window rules with {kcmshell}")
                 try:
-                    subprocess.Popen([self.kde_tools["kcmshell"], "kwinrules"])
+                    subprocess.Popen([kcmshell, "kwinrules"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening window rules with kcmshell: {e}")
             
             # Method 2: Try systemsettings
-            if not opened and "systemsettings" in self.kde_tools:
-                logger.debug(f"Opening system settings with {self.kde_tools['systemsettings']}")
+            if not opened and systemsettings:
+                logger.debug(f"Opening system settings with {systemsettings}")
                 try:
-                    if self.kde_tools["systemsettings"] == "systemsettings5":
-                        subprocess.Popen([self.kde_tools["systemsettings"], "kcm_kwinrules"])
+                    if systemsettings == "systemsettings5":
+                        subprocess.Popen([systemsettings, "kcm_kwinrules"])
                     else:
-                        subprocess.Popen([self.kde_tools["systemsettings"], "--section=windowmanagement", "--subsection=kwinrules"])
+                        subprocess.Popen([systemsettings, "--section=windowmanagement", "--subsection=kwinrules"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening system settings: {e}")
             
             # Method 3: Use xdg-open or kde-open to open the settings URL
-            if not opened and "opener" in self.kde_tools:
-                logger.debug(f"Opening window rules with {self.kde_tools['opener']}")
+            if not opened and opener:
+                logger.debug(f"Opening window rules with {opener}")
                 try:
-                    subprocess.Popen([self.kde_tools["opener"], "settings://kwinrules"])
+                    subprocess.Popen([opener, "settings://kwinrules"])
                     opened = True
                 except Exception as e:
                     logger.warning(f"Error opening window rules with opener: {e}")
             
-            if not opened:
-                # Last resort: Try a direct command
-                logger.debug("Trying direct command to open window rules")
-                try:
-                    subprocess.Popen(["kcmshell5", "kwinrules"])
-                    opened = True
-                except Exception:
-                    try:
-                        subprocess.Popen(["kcmshell6", "kwinrules"])
-                        opened = True
-                    except Exception as e:
-                        logger.warning(f"Error opening window rules with direct command: {e}")
-            
             if opened:
                 return True, (
                     f"Opened KWin window rules editor.\n\n"
@@ -328,25 +318,3 @@ class KWinManager:
         except Exception as e:
             logger.error(f"Error opening window rules editor: {e}")
             return False, f"Error opening window rules editor: {str(e)}"
-
-    def _is_command_available(self, command: str) -> bool:
-        """Check if a command is available in the PATH.
-
-        Args:
-            command: The command to check
-
-        Returns:
-            True if the command is available, False otherwise
-        """
-        try:
-            # Use subprocess.run instead of which for better compatibility
-            result = subprocess.run(
-                ["which", command], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True,
-                check=False
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
\ No newline at end of file
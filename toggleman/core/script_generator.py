@@ -5,16 +5,106 @@ This module handles generating toggle scripts based on templates and user config
 """
 
 import os
-import stat
+import functools
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from string import Template
 
 from toggleman.core.debug import get_logger
 
 logger = get_logger(__name__)
 
+# Placeholders filled in from the script configuration. Any other $NAME in
+# the template is left alone for bash.
+_TEMPLATE_VARS = frozenset((
+    "APP_COMMAND", "APP_PROCESS", "WINDOW_CLASS", "CHROME_EXEC", "CHROME_PROFILE",
+    "APP_ID", "TRAY_ICON_PATH", "TRAY_NAME", "DEBUG", "NOTIFICATIONS", "HOME",
+    "TRAY_ICON_DIR",
+))
+
+# Script configuration keys copied into template variables as-is
+_CONFIG_VARS = {
+    "app_command": "APP_COMMAND",
+    "app_process": "APP_PROCESS",
+    "window_class": "WINDOW_CLASS",
+    "chrome_exec": "CHROME_EXEC",
+    "chrome_profile": "CHROME_PROFILE",
+    "app_id": "APP_ID",
+    "icon_path": "TRAY_ICON_PATH",
+    "tray_name": "TRAY_NAME",
+}
+
+# Script configuration keys rendered as bash "true"/"false" flags
+_FLAG_VARS = {
+    "debug": "DEBUG",
+    "notifications": "NOTIFICATIONS",
+}
+
+# Template variable defaults for keys missing from the script configuration
+_DEFAULT_VARS = {
+    "APP_COMMAND": "",
+    "APP_PROCESS": "",
+    "WINDOW_CLASS": "",
+    "CHROME_EXEC": "",
+    "CHROME_PROFILE": "Default",
+    "APP_ID": "",
+    "TRAY_ICON_PATH": "",
+    "DEBUG": "false",
+    "NOTIFICATIONS": "true",
+}
+
+
+def _compile_template(text: str) -> str:
+    """Convert a string.Template body into an equivalent str.format string.
+
+    Placeholders in _TEMPLATE_VARS become {NAME} fields, $$ becomes $, and
+    everything else is kept literally with its braces escaped, matching
+    what Template.safe_substitute would produce.
+
+    Args:
+        text: The template body
+
+    Returns:
+        The template as a str.format_map() format string
+    """
+    parts = []
+    pos = 0
+
+    for match in Template.pattern.finditer(text):
+        parts.append(text[pos:match.start()].replace("{", "{{").replace("}", "}}"))
+
+        name = match.group("named") or match.group("braced")
+        if match.group("escaped") is not None:
+            parts.append("$")
+        elif name in _TEMPLATE_VARS:
+            parts.append(f"{{{name}}}")
+        else:
+            parts.append(match.group().replace("{", "{{").replace("}", "}}"))
+
+        pos = match.end()
+
+    parts.append(text[pos:].replace("{", "{{").replace("}", "}}"))
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_template_dir() -> Path:
+    """Find the template directory.
+
+    The result is cached, so the directory is only probed once per process
+    rather than once per ScriptGenerator.
+
+    Returns:
+        The system template directory, or the one bundled with the source
+        tree if the system one doesn't exist
+    """
+    template_dir = Path("/usr/share/toggleman/templates")
+    if template_dir.is_dir():
+        return template_dir
+
+    return Path(__file__).parent.parent.parent / "data" / "templates"
+
 
 class ScriptGenerator:
     """Generates toggle scripts from templates and configuration."""
@@ -26,13 +116,20 @@ class ScriptGenerator:
             config_manager: The configuration manager instance
         """
         self.config_manager = config_manager
-        self.template_dir = Path("/usr/share/toggleman/templates")
+        self.template_dir = _resolve_template_dir()
+        self.template_file = self.template_dir / "toggle_template.sh"
 
-        # Use fallback template path if system template dir doesn't exist
-        if not self.template_dir.exists():
-            self.template_dir = Path(__file__).parent.parent.parent / "data" / "templates"
+        # Compiled template along with the (mtime, size) signature of the file
+        # it was read from, so it is only re-read when the file changes
+        self._template_cache: Optional[Tuple[Tuple[int, int], str]] = None
 
-        self.template_file = self.template_dir / "toggle_template.sh"
+        # Values that don't depend on the script being generated
+        home_dir = os.path.expanduser("~")
+        self._default_script_dir = os.path.join(home_dir, ".local/bin")
+        self._constant_vars = {
+            "HOME": home_dir,
+            "TRAY_ICON_DIR": f"{home_dir}/.cache/toggle_app"
+        }
 
     def generate_script(self, script_name: str) -> Tuple[bool, str]:
         """Generate a toggle script from the configuration.
@@ -48,59 +145,62 @@ class ScriptGenerator:
         if not script_config:
             return False, f"Script configuration '{script_name}' not found"
 
-        # Load template
         try:
-            if not self.template_file.exists():
+            try:
+                script_content = self._render(script_name, script_config)
+            except FileNotFoundError:
                 return False, f"Template file not found at {self.template_file}"
 
-            with open(self.template_file, 'r') as f:
-                template_content = f.read()
-
-            # Get home directory
-            home_dir = os.path.expanduser("~")
-
-            # Prepare substitution variables with safe defaults
-            script_vars = {
-                # Required variables with defaults to avoid template errors
-                "APP_COMMAND": script_config.get("app_command", ""),
-                "APP_PROCESS": script_config.get("app_process", ""),
-                "WINDOW_CLASS": script_config.get("window_class", ""),
-                "CHROME_EXEC": script_config.get("chrome_exec", ""),
-                "CHROME_PROFILE": script_config.get("chrome_profile", "Default"),
-                "APP_ID": script_config.get("app_id", ""),
-                "TRAY_ICON_PATH": script_config.get("icon_path", ""),
-                "TRAY_NAME": script_config.get("tray_name", f"{script_name} Toggle"),
-                "DEBUG": "true" if script_config.get("debug", False) else "false",
-                "NOTIFICATIONS": "true" if script_config.get("notifications", True) else "false",
-                "HOME": home_dir,
-                "TRAY_ICON_DIR": f"{home_dir}/.cache/toggle_app"
-            }
-
-            # Create template with safe_substitute to avoid errors with missing placeholders
-            template = Template(template_content)
-            script_content = template.safe_substitute(script_vars)
-
             # Determine script path
             script_path = script_config.get("script_path", "")
-            if not script_path:
+            if script_path:
+                script_file = Path(script_path)
+            else:
                 default_dir = self.config_manager.get_setting("general", "default_script_dir",
-                                                              str(Path.home() / ".local/bin"))
-                script_path = os.path.join(default_dir, f"toggle-{script_name.lower()}.sh")
+                                                              self._default_script_dir)
+                script_file = Path(default_dir) / f"toggle-{script_name.lower()}.sh"
+                script_path = str(script_file)
 
-            # Ensure directory exists
-            script_dir = os.path.dirname(script_path)
-            os.makedirs(script_dir, exist_ok=True)
+            script_bytes = script_content.encode("utf-8")
 
-            # Write script file
-            with open(script_path, 'w') as f:
-                f.write(script_content)
+            # Leave the script (and its mtime) alone if regenerating it wouldn't
+            # change anything
+            if script_config.get("script_path") == script_path:
+                try:
+                    unchanged = script_file.read_bytes() == script_bytes
+                except OSError:
+                    unchanged = False
 
-            # Make script executable
-            os.chmod(script_path, os.stat(script_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                if unchanged and os.access(script_path, os.X_OK):
+                    return True, f"Script already up to date at {script_path}"
 
-            # Update script path in configuration
-            script_config["script_path"] = script_path
-            self.config_manager.save_script(script_name, script_config)
+            # Ensure directory exists
+            script_dir = script_file.parent
+            if not script_dir.is_dir():
+                script_dir.mkdir(parents=True, exist_ok=True)
+
+            # Write the script to a temporary file and move it into place, so a
+            # failed write never leaves a truncated script behind. The mode is
+            # set on the temporary file (the script is meant to be runnable by
+            # anyone) and carries over with the rename.
+            tmp_file = script_file.with_name(f"{script_file.name}.{os.getpid()}.tmp")
+            try:
+                tmp_file.write_bytes(script_bytes)
+                tmp_file.chmod(0o755)
+                os.replace(tmp_file, script_file)
+            except BaseException:
+                try:
+                    tmp_file.unlink()
+                except OSError:
+                    pass
+                raise
+
+            # Update script path in configuration. Callers save the rest of the
+            # configuration themselves, so it only needs writing when the path
+            # is new.
+            if script_config.get("script_path") != script_path:
+                script_config["script_path"] = script_path
+                self.config_manager.save_script(script_name, script_config)
 
             return True, f"Successfully generated script at {script_path}"
 
@@ -108,6 +208,99 @@ class ScriptGenerator:
             logger.error(f"Error generating script for {script_name}: {e}")
             return False, f"Error generating script: {str(e)}"
 
+    def render_script(self, script_name: str) -> Tuple[bool, str]:
+        """Render a toggle script without writing anything to disk.
+
+        Args:
+            script_name: The name of the script configuration to use
+
+        Returns:
+            Tuple of (success, script content or error message)
+        """
+        script_config = self.config_manager.get_script(script_name)
+        if not script_config:
+            return False, f"Script configuration '{script_name}' not found"
+
+        try:
+            return True, self._render(script_name, script_config)
+        except FileNotFoundError:
+            return False, f"Template file not found at {self.template_file}"
+        except Exception as e:
+            logger.error(f"Error rendering script for {script_name}: {e}")
+            return False, f"Error rendering script: {str(e)}"
+
+    def _render(self, script_name: str, script_config: Dict[str, Any]) -> str:
+        """Render the template for a script configuration.
+
+        Args:
+            script_name: The name of the script
+            script_config: The script configuration
+
+        Returns:
+            The script content
+
+        Raises:
+            FileNotFoundError: If the template file doesn't exist
+        """
+        template = self._load_template()
+
+        # Prepare substitution variables, starting from safe defaults so
+        # every placeholder has a value
+        script_vars = {**_DEFAULT_VARS, "TRAY_NAME": script_name + " Toggle", **self._constant_vars}
+        for key, value in script_config.items():
+            var = _CONFIG_VARS.get(key)
+            if var is not None:
+                script_vars[var] = value
+            elif key in _FLAG_VARS:
+                script_vars[_FLAG_VARS[key]] = "true" if value else "false"
+
+        return template.format_map(script_vars)
+
+    def generate_scripts(self, script_names: List[str]) -> List[Tuple[bool, str]]:
+        """Generate several toggle scripts concurrently.
+
+        Generating a script is mostly file I/O, so the scripts are generated
+        on a thread pool.
+
+        Args:
+            script_names: The names of the script configurations to use
+
+        Returns:
+            List of (success, message) tuples, in the same order as script_names
+        """
+        if not script_names:
+            return []
+
+        # Load the template up front so the workers share the cached copy
+        # instead of all reading it at once
+        try:
+            self._load_template()
+        except OSError:
+            pass
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(32, len(script_names))) as executor:
+            return list(executor.map(self.generate_script, script_names))
+
+    def _load_template(self) -> str:
+        """Load the script template, reusing the cached copy if the file is unchanged.
+
+        Returns:
+            The template compiled into a str.format_map() format string
+
+        Raises:
+            FileNotFoundError: If the template file doesn't exist
+        """
+        st = self.template_file.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+
+        if self._template_cache is None or self._template_cache[0] != signature:
+            template_content = self.template_file.read_text(encoding="utf-8")
+            self._template_cache = (signature, _compile_template(template_content))
+
+        return self._template_cache[1]
+
     def delete_script(self, script_name: str) -> Tuple[bool, str]:
         """Delete a toggle script.
 
@@ -122,21 +315,26 @@ class ScriptGenerator:
         if not script_config:
             return False, f"Script configuration '{script_name}' not found"
 
-        # Get script path
+        # Delete the script file. Removing it straight away, rather than
+        # checking for it first, also tells us whether it existed.
         script_path = script_config.get("script_path", "")
-        if not script_path or not os.path.exists(script_path):
-            # Just delete the configuration if script doesn't exist
-            self.config_manager.delete_script(script_name)
-            return True, f"Deleted script configuration for {script_name}"
-
-        # Delete the script file
-        try:
-            os.remove(script_path)
-            self.config_manager.delete_script(script_name)
+        script_deleted = False
+        if script_path:
+            try:
+                os.remove(script_path)
+                script_deleted = True
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Error deleting script {script_path}: {e}")
+                return False, f"Error deleting script: {str(e)}"
+
+        self.config_manager.delete_script(script_name)
+
+        if script_deleted:
             return True, f"Deleted script {script_path} and its configuration"
-        except Exception as e:
-            logger.error(f"Error deleting script {script_path}: {e}")
-            return False, f"Error deleting script: {str(e)}"
+        # Just the configuration was deleted if the script doesn't exist
+        return True, f"Deleted script configuration for {script_name}"
 
     def install_template(self, template_path: Optional[str] = None) -> Tuple[bool, str]:
         """Install a toggle script template.
@@ -149,7 +347,9 @@ class ScriptGenerator:
         """
         try:
             # Create template directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.template_file), exist_ok=True)
+            template_dir = self.template_file.parent
+            if not template_dir.is_dir():
+                template_dir.mkdir(parents=True, exist_ok=True)
 
             if template_path and os.path.exists(template_path):
                 # Copy custom template
@@ -157,10 +357,7 @@ class ScriptGenerator:
                 return True, f"Installed custom template from {template_path}"
             else:
                 # Install default template
-                default_template = self._get_default_template()
-
-                with open(self.template_file, 'w') as f:
-                    f.write(default_template)
+                self.template_file.write_text(_DEFAULT_TEMPLATE, encoding="utf-8")
 
                 return True, "Installed default template"
 
@@ -170,7 +367,11 @@ class ScriptGenerator:
 
     def _get_default_template(self) -> str:
         """Get the default toggle script template."""
-        return '''#!/bin/bash
+        return _DEFAULT_TEMPLATE
+
+
+# The template installed by install_template() when no custom template is given
+_DEFAULT_TEMPLATE = '''#!/bin/bash
 # Generated Toggle Script by Toggleman
 # Do not edit directly - use Toggleman to modify this script
 
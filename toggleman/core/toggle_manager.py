@@ -6,6 +6,8 @@ and monitoring their status.
 """
 
 import os
+import re
+import functools
 import subprocess
 import signal
 import stat
@@ -20,6 +22,163 @@ from toggleman.core.script_generator import ScriptGenerator
 
 logger = get_logger(__name__)
 
+# How long a process scan is reused before the process table is read again
+_PROCESS_CACHE_TTL = 0.5
+
+# Toggle scripts run detached with stdin and output on /dev/null
+_SPAWN_FILE_ACTIONS = [
+    (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+    (os.POSIX_SPAWN_DUP2, 1, 2),
+]
+
+
+def _spawn_file_actions() -> List[tuple]:
+    """Build the posix_spawn file actions for a toggle script.
+
+    Besides redirecting stdio, this closes every inheritable descriptor
+    above stderr, as Popen's close_fds=True does, so the script and the app
+    it launches don't hold on to the manager's files and sockets.
+
+    Returns:
+        The file actions to pass to os.posix_spawn
+    """
+    actions = list(_SPAWN_FILE_ACTIONS)
+
+    try:
+        fds = [int(name) for name in os.listdir("/proc/self/fd")]
+    except OSError:
+        return actions
+
+    for fd in fds:
+        if fd <= 2:
+            continue
+        try:
+            if os.get_inheritable(fd):
+                actions.append((os.POSIX_SPAWN_CLOSE, fd))
+        except OSError:
+            # Closed since the listing (e.g. the descriptor listdir used)
+            pass
+
+    return actions
+
+
+# Fields a toggle needs before its script can be generated
+_REQUIRED_FIELDS = ("app_command", "app_process", "window_class")
+
+# Execute permission for user, group and others
+_EXEC_BITS = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+
+def _stat_script(script_path: str) -> Optional[os.stat_result]:
+    """Stat a script file.
+
+    Args:
+        script_path: Path to the script file
+
+    Returns:
+        The stat result, or None if there is no regular file at the path
+    """
+    if not script_path:
+        return None
+
+    try:
+        st = os.stat(script_path)
+    except OSError:
+        return None
+
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_process_pattern(pattern: str) -> "re.Pattern":
+    """Compile an app process pattern the way pgrep -f would use it.
+
+    Args:
+        pattern: The extended regular expression to match command lines against
+
+    Returns:
+        The compiled pattern; a pattern that isn't a valid regular expression
+        is matched literally
+    """
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return re.compile(re.escape(pattern))
+
+
+# Backreferences (\1, (?P=name)) and conditional groups ((?(1)...)) in a pattern
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+# Global inline flags ((?i), (?x)) in a pattern
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_process_prefilter(patterns: Tuple[str, ...]) -> Optional["re.Pattern"]:
+    """Combine app process patterns into a single alternation.
+
+    A command line that doesn't match the combined pattern can't match any
+    of the individual ones, so most processes are rejected with one search
+    instead of one per script.
+
+    Args:
+        patterns: The app process patterns to combine
+
+    Returns:
+        The compiled alternation, or None if the patterns can't be combined
+        (they use backreferences or global inline flags)
+    """
+    sources = [_compile_process_pattern(pattern).pattern for pattern in patterns]
+
+    # Group numbers shift once the patterns are joined, so a backreference
+    # would point at another pattern's group
+    if any(_GROUP_REFERENCE.search(source) for source in sources):
+        return None
+
+    # Global flags apply to the whole pattern, so once joined they'd change
+    # how the other patterns match (Python < 3.11 only warns about a flag
+    # that isn't at the start, rather than raising)
+    if any(_INLINE_FLAGS.search(source) for source in sources):
+        return None
+
+    try:
+        return re.compile("|".join(f"(?:{source})" for source in sources))
+    except re.error:
+        return None
+
+
+def _iter_process_cmdlines():
+    """Iterate over the command lines of the running processes.
+
+    Arguments are joined with spaces, as pgrep -f sees them. Processes
+    without a command line (kernel threads, zombies) and this process
+    itself are skipped.
+
+    Yields:
+        Tuples of (pid, command line)
+    """
+    own_pid = os.getpid()
+
+    with os.scandir("/proc") as it:
+        for entry in it:
+            if not entry.name.isdigit():
+                continue
+
+            pid = int(entry.name)
+            if pid == own_pid:
+                continue
+
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    cmdline = f.read()
+            except OSError:
+                # The process exited while we were scanning
+                continue
+
+            if cmdline:
+                yield pid, cmdline.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+
 
 class ToggleManager:
     """Manages toggle scripts, including running and monitoring."""
@@ -36,6 +195,11 @@ class ToggleManager:
         # Initialize script cache
         self.script_cache = {}
         self.running_processes = {}
+        self._process_cache_time = None
+        self._process_cache_version = None
+        self._process_index = None
+        self._spawned_pids = set()
+        self._test_env = None
 
     def create_toggle(self, name: str, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Create a new toggle script.
@@ -171,48 +335,43 @@ class ToggleManager:
         Returns:
             Tuple of (success, message)
         """
-        # Get script configuration
-        script_config = self.config_manager.get_script(name)
-        if not script_config:
-            return False, f"Toggle script '{name}' not found"
-
         # Check if this is a draft
-        if script_config.get("is_draft", False):
+        script_config = self.config_manager.get_script(name)
+        if script_config and script_config.get("is_draft", False):
             return False, f"Cannot run draft script '{name}'. Please complete the script configuration first."
 
-        # Get script path
-        script_path = script_config.get("script_path", "")
-        if not script_path or not os.path.exists(script_path):
-            # Try to generate the script if it doesn't exist
-            success, message = self.script_generator.generate_script(name)
-            if not success:
-                return False, f"Script file not found and could not be generated: {message}"
+        success, message, script_config, script_path, script_stat = self._resolve_script(name)
+        if not success:
+            return False, message
 
-            # Get updated script config with path
-            script_config = self.config_manager.get_script(name)
-            script_path = script_config.get("script_path", "")
-
-            if not script_path or not os.path.exists(script_path):
-                return False, f"Failed to generate script file at {script_path}"
-
-        # Check if script is executable
-        if not os.access(script_path, os.X_OK):
-            try:
-                # Try to make it executable
-                os.chmod(script_path, os.stat(script_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-            except Exception as e:
-                return False, f"Script file exists but is not executable: {e}"
+        success, message = self._ensure_executable(script_path, script_stat)
+        if not success:
+            return False, message
 
         # Run the script
+        self._reap_spawned()
         try:
-            # Run with shell=False for better security
-            process = subprocess.Popen([script_path],
-                                      stdout=subprocess.PIPE,
-                                      stderr=subprocess.PIPE,
-                                      start_new_session=True)  # Detach the process
+            # Spawn straight into a new session with stdio on /dev/null; the
+            # script's output is never read, and it must outlive the GUI
+            pid = os.posix_spawn(script_path, [script_path], os.environ,
+                                 file_actions=_spawn_file_actions(),
+                                 setsid=True)
+            self._spawned_pids.add(pid)
 
             # Don't wait for it to complete - return immediately
             return True, f"Running toggle script {name}"
+        except NotImplementedError:
+            # posix_spawn without setsid support; fall back to a detached Popen
+            try:
+                subprocess.Popen([script_path],
+                                 stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
+                return True, f"Running toggle script {name}"
+            except Exception as e:
+                logger.error(f"Error running toggle script {name}: {e}")
+                return False, f"Error running toggle script: {str(e)}"
         except Exception as e:
             logger.error(f"Error running toggle script {name}: {e}")
             return False, f"Error running toggle script: {str(e)}"
@@ -226,39 +385,45 @@ class ToggleManager:
         Returns:
             Tuple of (success, message, details)
         """
-        # Get script configuration
-        script_config = self.config_manager.get_script(name)
-        if not script_config:
-            return False, f"Toggle script '{name}' not found", {}
+        return self.test_toggle_with_timeout(name, 10)
 
-        # Get script path
-        script_path = script_config.get("script_path", "")
-        if not script_path or not os.path.exists(script_path):
-            # Try to generate the script if it doesn't exist
-            success, message = self.script_generator.generate_script(name)
-            if not success:
-                return False, f"Script file not found and could not be generated: {message}", {}
+    def test_toggle_with_timeout(self, name: str, timeout: int = 3) -> Tuple[bool, str, Dict[str, Any]]:
+        """Test a toggle script with timeout and return detailed output.
 
-            # Get updated script config with path
-            script_config = self.config_manager.get_script(name)
-            script_path = script_config.get("script_path", "")
+        Args:
+            name: The name of the toggle script
+            timeout: Timeout in seconds
 
-        # Set debug mode for the test
-        test_env = os.environ.copy()
-        test_env["DEBUG"] = "true"
+        Returns:
+            Tuple of (success, message, details). The script's output is in
+            details as bytes; use get_test_output() to read it as text.
+        """
+        success, message, script_config, script_path, script_stat = self._resolve_script(name)
+        if not success:
+            return False, message, {}
+
+        success, message = self._ensure_executable(script_path, script_stat)
+        if not success:
+            return False, message, {
+                "stdout_bytes": b"",
+                "stderr_bytes": message.encode("utf-8"),
+                "return_code": -1,
+                "script_path": script_path,
+                "config": script_config
+            }
 
         # Run the script with capture
         try:
             result = subprocess.run([script_path],
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    env=test_env,
-                                    encoding='utf-8',
-                                    timeout=10)
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE,
+                                   env=self._get_test_env(),
+                                   timeout=timeout)
 
+            # Output is kept as bytes and only decoded when someone reads it
             details = {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
+                "stdout_bytes": result.stdout,
+                "stderr_bytes": result.stderr,
                 "return_code": result.returncode,
                 "script_path": script_path,
                 "config": script_config
@@ -270,9 +435,9 @@ class ToggleManager:
                 return False, f"Toggle script test failed with return code {result.returncode}", details
 
         except subprocess.TimeoutExpired:
-            return False, "Toggle script test timed out after 10 seconds", {
-                "stdout": "Timeout",
-                "stderr": "Script execution timed out after 10 seconds",
+            return False, f"Toggle script test timed out after {timeout} seconds", {
+                "stdout_bytes": b"Timeout",
+                "stderr_bytes": f"Script execution timed out after {timeout} seconds".encode("utf-8"),
                 "return_code": -1,
                 "script_path": script_path,
                 "config": script_config
@@ -280,97 +445,117 @@ class ToggleManager:
         except Exception as e:
             logger.error(f"Error testing toggle script {name}: {e}")
             return False, f"Error testing toggle script: {str(e)}", {
-                "stdout": "",
-                "stderr": str(e),
+                "stdout_bytes": b"",
+                "stderr_bytes": str(e).encode("utf-8"),
                 "return_code": -1,
                 "script_path": script_path,
                 "config": script_config
             }
 
-    def test_toggle_with_timeout(self, name: str, timeout: int = 3) -> Tuple[bool, str, Dict[str, Any]]:
-        """Test a toggle script with timeout and return detailed output.
+    def test_all(self, timeout: int = 3) -> Dict[str, Tuple[bool, str, Dict[str, Any]]]:
+        """Test every toggle script that isn't a draft.
+
+        The scripts spend their time waiting on external tools, so they are
+        tested concurrently and the whole run takes about as long as the
+        slowest script.
+
+        Args:
+            timeout: Timeout in seconds for each script
+
+        Returns:
+            Dictionary mapping script names to (success, message, details)
+        """
+        names = [name for name, config in self.config_manager.get_all_scripts().items()
+                 if not config.get("is_draft", False)]
+        if not names:
+            return {}
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(32, len(names))) as executor:
+            results = executor.map(lambda name: self.test_toggle_with_timeout(name, timeout), names)
+            return dict(zip(names, results))
+
+    @staticmethod
+    def get_test_output(details: Dict[str, Any], stream: str = "stdout") -> str:
+        """Get a tested script's output as text.
+
+        Args:
+            details: The details returned by test_toggle
+            stream: Either "stdout" or "stderr"
+
+        Returns:
+            The decoded output
+        """
+        return details.get(f"{stream}_bytes", b"").decode("utf-8", "replace")
+
+    def _get_test_env(self) -> Dict[str, str]:
+        """Get the environment toggle scripts are tested with.
+
+        Built once from os.environ with debug mode switched on.
+
+        Returns:
+            The test environment
+        """
+        if self._test_env is None:
+            test_env = os.environ.copy()
+            test_env["DEBUG"] = "true"
+            self._test_env = test_env
+
+        return self._test_env
+
+    def _resolve_script(self, name: str) -> Tuple[bool, str, Optional[Dict[str, Any]], str, Optional[os.stat_result]]:
+        """Look up a toggle script, generating its file if it is missing.
 
         Args:
             name: The name of the toggle script
-            timeout: Timeout in seconds
 
         Returns:
-            Tuple of (success, message, details)
+            Tuple of (success, message, script config, script path, script
+            stat). The stat is None when the file was just generated.
         """
         # Get script configuration
         script_config = self.config_manager.get_script(name)
         if not script_config:
-            return False, f"Toggle script '{name}' not found", {}
+            return False, f"Toggle script '{name}' not found", None, "", None
 
         # Get script path
         script_path = script_config.get("script_path", "")
-        if not script_path or not os.path.exists(script_path):
+        script_stat = _stat_script(script_path)
+        if script_stat is None:
             # Try to generate the script if it doesn't exist
             success, message = self.script_generator.generate_script(name)
             if not success:
-                return False, f"Script file not found and could not be generated: {message}", {}
+                return False, f"Script file not found and could not be generated: {message}", script_config, script_path, None
 
-            # Get updated script config with path
+            # A successful generation has written the file and recorded its
+            # path, so there is no need to check for it again
             script_config = self.config_manager.get_script(name)
             script_path = script_config.get("script_path", "")
 
+        return True, "", script_config, script_path, script_stat
+
+    def _ensure_executable(self, script_path: str,
+                           script_stat: Optional[os.stat_result] = None) -> Tuple[bool, str]:
+        """Make sure a script file can be executed.
+
+        Args:
+            script_path: Path to the script file
+            script_stat: The script's stat result, if the caller already has it
+
+        Returns:
+            Tuple of (success, message)
+        """
         # Check if script is executable
         if not os.access(script_path, os.X_OK):
             try:
                 # Try to make it executable
-                os.chmod(script_path, os.stat(script_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                mode = (script_stat or os.stat(script_path)).st_mode
+                os.chmod(script_path, mode | _EXEC_BITS)
             except Exception as e:
-                return False, f"Script file exists but is not executable: {e}", {
-                    "stdout": "",
-                    "stderr": f"Script not executable: {e}",
-                    "return_code": -1,
-                    "script_path": script_path,
-                    "config": script_config
-                }
-
-        # Set debug mode for the test
-        test_env = os.environ.copy()
-        test_env["DEBUG"] = "true"
-
-        # Run the script with capture
-        try:
-            result = subprocess.run([script_path],
-                                   stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE,
-                                   env=test_env,
-                                   encoding='utf-8',
-                                   timeout=timeout)
-
-            details = {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode,
-                "script_path": script_path,
-                "config": script_config
-            }
+                return False, f"Script file exists but is not executable: {e}"
 
-            if result.returncode == 0:
-                return True, "Toggle script test completed successfully", details
-            else:
-                return False, f"Toggle script test failed with return code {result.returncode}", details
-
-        except subprocess.TimeoutExpired:
-            return False, f"Toggle script test timed out after {timeout} seconds", {
-                "stdout": "Timeout",
-                "stderr": f"Script execution timed out after {timeout} seconds",
-                "return_code": -1,
-                "script_path": script_path,
-                "config": script_config
-            }
-        except Exception as e:
-            logger.error(f"Error testing toggle script {name}: {e}")
-            return False, f"Error testing toggle script: {str(e)}", {
-                "stdout": "",
-                "stderr": str(e),
-                "return_code": -1,
-                "script_path": script_path,
-                "config": script_config
-            }
+        return True, ""
 
     def get_running_toggles(self) -> Dict[str, Dict[str, Any]]:
         """Get information about all running toggle processes.
@@ -397,42 +582,96 @@ class ToggleManager:
 
         return name in self.running_processes
 
-    def _update_process_cache(self) -> None:
-        """Update the cache of running toggle processes."""
-        # Clear the current cache
-        self.running_processes = {}
+    def _update_process_cache(self, force: bool = False) -> None:
+        """Update the cache of running toggle processes.
 
-        # Get all script configurations
-        scripts = self.config_manager.get_all_scripts()
+        A scan younger than _PROCESS_CACHE_TTL is reused as long as no script
+        has been saved or deleted since, so UI polling doesn't walk the
+        process table on every call.
 
-        for name, config in scripts.items():
-            # Get script path
-            script_path = config.get("script_path", "")
-            if not script_path or not os.path.exists(script_path):
-                continue
-
-            # Get app process pattern
-            app_process = config.get("app_process", "")
-            if not app_process:
-                continue
+        Args:
+            force: Rescan even if the cached result is still fresh
+        """
+        now = time.monotonic()
+        version = self.config_manager.scripts_version
+        if (not force and self._process_cache_time is not None
+                and now - self._process_cache_time < _PROCESS_CACHE_TTL
+                and version == self._process_cache_version):
+            return
+
+        self._reap_spawned()
+
+        # Only scripts whose file exists are checked
+        entries, prefilter = self._get_process_index()
+        matchers = [(name, config, regex) for name, config, script_path, regex in entries
+                    if _stat_script(script_path) is not None]
+
+        running_processes = {}
+
+        if matchers:
+            # Walk the process table once and match every pattern against each
+            # command line, rather than running pgrep once per script
+            for pid, cmdline in _iter_process_cmdlines():
+                if prefilter is not None and not prefilter.search(cmdline):
+                    continue
+
+                for name, config, regex in matchers:
+                    if regex.search(cmdline):
+                        if name in running_processes:
+                            running_processes[name]["pids"].append(pid)
+                        else:
+                            running_processes[name] = {
+                                "pids": [pid],
+                                "config": config
+                            }
+
+        self.running_processes = running_processes
+        self._process_cache_time = now
+        self._process_cache_version = version
+
+    def _get_process_index(self) -> Tuple[List[Tuple[str, Dict[str, Any], str, "re.Pattern"]], Optional["re.Pattern"]]:
+        """Get the scripts whose app process can be checked.
+
+        The index is rebuilt only when a script has been saved or deleted.
 
-            # Check if the app is running
+        Returns:
+            Tuple of ((name, config, script path, compiled pattern) entries,
+            combined prefilter pattern)
+        """
+        version = self.config_manager.scripts_version
+        if self._process_index is None or self._process_index[0] != version:
+            entries = []
+            for name, config in self.config_manager.get_all_scripts().items():
+                script_path = config.get("script_path", "")
+                app_process = config.get("app_process", "")
+                if script_path and app_process:
+                    entries.append((name, config, script_path, _compile_process_pattern(app_process)))
+
+            prefilter = None
+            if entries:
+                prefilter = _compile_process_prefilter(
+                    tuple(config["app_process"] for _, config, _, _ in entries))
+
+            self._process_index = (version, entries, prefilter)
+
+        return self._process_index[1], self._process_index[2]
+
+    def _reap_spawned(self) -> None:
+        """Collect the exit status of toggle scripts that have finished.
+
+        Scripts started by run_toggle are children of this process, so they
+        linger as zombies until they are waited for. They are collected
+        without blocking at the next run_toggle or process cache refresh;
+        in the tray, the main window's refresh timer polls the process cache,
+        so a finished script is reaped within one refresh interval.
+        """
+        for pid in list(self._spawned_pids):
             try:
-                # Use pgrep to check for the app process
-                result = subprocess.run(["pgrep", "-f", app_process],
-                                        stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE)
-
-                if result.returncode == 0:
-                    # Get list of PIDs
-                    pids = result.stdout.decode('utf-8').strip().split('\n')
-
-                    self.running_processes[name] = {
-                        "pids": pids,
-                        "config": config
-                    }
-            except Exception as e:
-                logger.error(f"Error checking if {name} is running: {e}")
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self._spawned_pids.discard(pid)
 
     def _stop_process(self, name: str) -> bool:
         """Stop a running toggle process.
@@ -445,7 +684,7 @@ class ToggleManager:
         """
         # Check if process is in cache
         if name not in self.running_processes:
-            self._update_process_cache()
+            self._update_process_cache(force=True)
 
             if name not in self.running_processes:
                 return False
@@ -456,10 +695,12 @@ class ToggleManager:
 
         # Stop each PID
         success = True
-        for pid_str in pids:
+        for pid in pids:
             try:
-                pid = int(pid_str)
                 os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                # Already exited since the scan
+                pass
             except Exception as e:
                 logger.error(f"Error stopping process {pid} for {name}: {e}")
                 success = False
@@ -480,9 +721,7 @@ class ToggleManager:
             True if the configuration is valid, False otherwise
         """
         # Check for required fields
-        required_fields = ["app_command", "app_process", "window_class"]
-
-        for field in required_fields:
+        for field in _REQUIRED_FIELDS:
             if field not in config or not config[field]:
                 logger.error(f"Missing required field in config: {field}")
                 return False
@@ -499,26 +738,14 @@ class ToggleManager:
         Returns:
             Tuple of (success, message)
         """
-        # Get script configuration
-        script_config = self.config_manager.get_script(name)
-        if not script_config:
-            return False, f"Toggle script '{name}' not found"
-
-        # Get script path
-        script_path = script_config.get("script_path", "")
-        if not script_path or not os.path.exists(script_path):
-            # Try to generate the script if it doesn't exist
-            success, message = self.script_generator.generate_script(name)
-            if not success:
-                return False, f"Script file not found and could not be generated: {message}"
-
-            # Get updated script config with path
-            script_config = self.config_manager.get_script(name)
-            script_path = script_config.get("script_path", "")
+        success, message, script_config, script_path, script_stat = self._resolve_script(name)
+        if not success:
+            return False, message
 
         # Export the script
         try:
-            shutil.copy2(script_path, export_path)
+            # Only the contents matter; the mode is set explicitly below
+            shutil.copyfile(script_path, export_path)
             os.chmod(export_path, 0o755)  # Make executable
             return True, f"Exported toggle script to {export_path}"
         except Exception as e:
@@ -1111,7 +1111,7 @@ class WebAppDetector:
         try:
             result = subprocess.run(["which", browser_type],
                                     stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL,
                                     text=True,
                                     check=False)
             if result.returncode == 0 and result.stdout.strip():
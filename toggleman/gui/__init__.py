@@ -2,10 +2,21 @@
 GUI package for Toggleman application.
 
 This package provides the graphical user interface for managing toggle scripts.
+
+Submodules are imported lazily on first attribute access, so importing a
+single dialog doesn't pull in the rest of the GUI.
 """
 
-from toggleman.gui.main_window import MainWindow
-from toggleman.gui.settings_dialog import SettingsDialog
-from toggleman.gui.script_editor import ScriptEditorDialog
-from toggleman.gui.icon_selector import IconSelectorDialog
-from toggleman.gui.web_app_selector import WebAppSelectorDialog
\ No newline at end of file
+from toggleman._lazy import lazy_exports
+
+_LAZY_IMPORTS = {
+    "MainWindow": "toggleman.gui.main_window",
+    "SettingsDialog": "toggleman.gui.settings_dialog",
+    "ScriptEditorDialog": "toggleman.gui.script_editor",
+    "IconSelectorDialog": "toggleman.gui.icon_selector",
+    "WebAppSelectorDialog": "toggleman.gui.web_app_selector",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -373,11 +373,11 @@ class ScriptEditorDialog(QDialog):
             process = subprocess.Popen(
                 ["xprop", "WM_CLASS"],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 universal_newlines=True
             )
 
-            stdout, stderr = process.communicate()
+            stdout, _ = process.communicate()
 
             if process.returncode == 0 and stdout:
                 # Parse window class
@@ -542,13 +542,13 @@ class ScriptEditorDialog(QDialog):
         # Show stdout
         self.test_output_edit.setTextColor(Qt.black)
         self.test_output_edit.append("--- Standard Output ---")
-        self.test_output_edit.append(details.get("stdout", ""))
+        self.test_output_edit.append(self.toggle_manager.get_test_output(details, "stdout"))
 
         # Show stderr if any
-        if details.get("stderr"):
+        if details.get("stderr_bytes"):
             self.test_output_edit.setTextColor(Qt.red)
             self.test_output_edit.append("\n--- Error Output ---")
-            self.test_output_edit.append(details.get("stderr", ""))
+            self.test_output_edit.append(self.toggle_manager.get_test_output(details, "stderr"))
 
         # Remove temporary script configuration if creating new script
         if not self.script_name: